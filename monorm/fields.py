@@ -1,6 +1,6 @@
 from collections import abc
 from datetime import datetime
-from typing import Any, Callable, MutableMapping, MutableSequence, Union, Optional, Dict
+from typing import Any, Callable, MutableMapping, MutableSequence, Union, Optional, Dict, List, Tuple, FrozenSet
 
 from bson.objectid import ObjectId
 
@@ -25,6 +25,11 @@ __all__ = [
 ]
 
 
+class DataDict(dict):
+    """The default `dict_class` of models: a plain dict which can also carry attributes,
+    e.g. the `_skip_validate` mark set in :meth:`EmbeddedField.convert`."""
+
+
 class ValidationError(Exception):
     def __init__(self, msg):
         self.msg = msg
@@ -65,9 +70,48 @@ def validate_fn(value: Any, validator: Callable[[Any], bool]) -> None:
         raise ValidationError('{!r} was not accepted by validator {!r}.'.format(value, validator))
 
 
+# names available to the source generated by `Field._validation_source`
+_codegen_globals = {
+    'ValidationError': ValidationError,
+    'validate_type': validate_type,
+    'validate_fn': validate_fn,
+    'validate_max_value': validate_max_value,
+    'validate_min_value': validate_min_value,
+    'validate_max_length': validate_max_length,
+    'validate_min_length': validate_min_length,
+}
+
+# the concrete types usually seen for an expected type, checked before `isinstance`;
+# converted embedded data is a `DataDict` unless the model sets another `dict_class`
+_exact_types = {
+    abc.MutableSequence: (list,),
+    abc.MutableMapping: (dict, DataDict),
+}
+
+# field options which the compiled validator, the model fast path and the repr of a field depend on
+_option_attrs = frozenset([
+    'name', 'required', 'default', 'converter', 'validator',
+    'max_length', 'min_length', 'max_value', 'min_value'
+])
+
+
+def _compile_functions(lines: List[str], filename: str, namespace: Dict[str, Any]) -> Dict[str, Any]:
+    namespace = dict(_codegen_globals, **namespace)
+    exec(compile('\n'.join(lines), filename, 'exec'), namespace)
+    return namespace
+
+
 class Field:
     expected_types = ()
 
+    # cheap type flags checked in the descriptor hot path instead of `isinstance`
+    _is_field: bool = True
+    _is_embedded: bool = False
+    _is_array: bool = False
+
+    # model classes declaring this field, whose generated fast path depends on its options
+    _owners: Tuple[type, ...] = ()
+
     def __init__(
         self,
         name: str = None,
@@ -82,6 +126,12 @@ class Field:
         self.converter = converter
         self.validator = validator
 
+    @property
+    def _is_trivial(self) -> bool:
+        # `convert` of such a field returns the value untouched; not cached because
+        # defaults and converters are assigned after the field is created
+        return type(self).convert is Field.convert and self.default is None and self.converter is None
+
     def convert(self, value: Any) -> Any:
         if value is None:
             if callable(self.default):
@@ -93,74 +143,143 @@ class Field:
         return value
 
     def validate(self, value: Any) -> None:
-        if value is None:
-            if self.required:
-                raise ValidationError('Field {!r} is missing.'.format(self.name))
+        self._validate_fn(value)
+
+    @cachedproperty
+    def _validate_fn(self) -> Callable[[Any], None]:
+        # all checks of this field compiled into a single function
+        namespace = {}
+        lines = ['def validate(v):']
+        lines.extend('    ' + line for line in self._validation_source('_f', namespace))
+        return _compile_functions(lines, '<monorm validator {!r}>'.format(self.name), namespace)['validate']
+
+    def _validation_source(self, ref: str, namespace: Dict[str, Any]) -> List[str]:
+        """Return source lines which validate the value bound to `v`.
+        Objects used by the lines are added to `namespace` under names prefixed with `ref`.
+        """
+        if self.required:
+            namespace[ref + '_missing'] = 'Field {!r} is missing.'.format(self.name)
+            lines = ['if v is None:', '    raise ValidationError({}_missing)'.format(ref), 'else:']
+        else:
+            lines = ['if v is not None:']
+        lines.extend('    ' + line for line in self._value_validation_source(ref, namespace) or ['pass'])
+        return lines
+
+    def _value_validation_source(self, ref: str, namespace: Dict[str, Any]) -> List[str]:
+        types = self.expected_types
+        namespace[ref + '_types'] = types
+        if types == (object,):
+            lines = []
+        elif len(types) == 1:
+            # `type(v) is T` is cheaper than `isinstance` and covers the usual case;
+            # subclasses and virtual subclasses of abstract types still go through `isinstance`
+            exact = _exact_types.get(types[0], types)
+            if len(exact) == 1:
+                namespace[ref + '_type'] = exact[0]
+                check = 'type(v) is not {}_type'.format(ref)
+            else:
+                namespace[ref + '_exact'] = exact
+                check = 'type(v) not in {}_exact'.format(ref)
+            lines = [
+                'if {0} and not isinstance(v, {1}_types):'.format(check, ref),
+                '    validate_type(v, {}_types)'.format(ref),
+            ]
         else:
-            validate_type(value, self.expected_types)
-            if self.validator:
-                validate_fn(value, self.validator)
+            lines = [
+                'if not isinstance(v, {}_types):'.format(ref),
+                '    validate_type(v, {}_types)'.format(ref),
+            ]
+        if self.validator:
+            namespace[ref + '_validator'] = self.validator
+            lines.append('validate_fn(v, {}_validator)'.format(ref))
+        return lines
+
+    @staticmethod
+    def _limit_source(ref: str, namespace: Dict[str, Any], attr: str, limit: Any, cond: str) -> List[str]:
+        if limit is None:
+            return []
+        name = '{}_{}'.format(ref, attr)
+        namespace[name] = limit
+        return ['if {}:'.format(cond.format(name)), '    validate_{}(v, {})'.format(attr, name)]
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # options like `required` or `validator` may also be set after construction, e.g. by `Meta`
+        if name in _option_attrs:
+            dk = self.__dict__
+            dk.pop('_validate_fn', None)
+            dk.pop('_repr_prefix', None)
+            for model in self._owners:
+                if '_fastpath' in model.__dict__:
+                    del model._fastpath
 
     def __get__(self, instance, cls) -> Any:
         if instance is None:
             return self
 
-        dk = instance.__dict__
+        nested = self._is_embedded or self._is_array
+        if nested:
+            # already materialized; `None` is never cached
+            rv = instance._cache.get(self.name)
+            if rv is not None:
+                return rv
+
         try:
-            value = dk['_data'][self.name]
+            value = instance._data[self.name]
         except KeyError:
             raise AttributeError('Field {!r} has no value; '
                                  'did you filter it out using projection query?'.format(self.name)) from None
-        if value is None:
-            return None
-
-        if not isinstance(self, (EmbeddedField, ArrayField)):
+        if value is None or not nested:
             return value
 
-        if self.name in dk:
-            return dk[self.name]
-
-        if isinstance(self, EmbeddedField):
+        if self._is_embedded:
             rv = self.model.from_data(value)
         else:
             rv = self._convert_data_in_list_to_model(value)
 
-        dk[self.name] = rv
+        instance._cache[self.name] = rv
 
         return rv
 
     def __set__(self, instance, value):
+        deleted = value is None and not type(instance).retain_none
         value = self.convert(value)
         self.validate(value)
 
-        dk = instance.__dict__
+        data = instance._data
+        cache = instance._cache
         if value is not None:
-            dk['_data'][self.name] = value
-            if isinstance(self, EmbeddedField):
-                dk[self.name] = self.model.from_data(value)
-            if isinstance(self, ArrayField):
-                dk[self.name] = self._convert_data_in_list_to_model(value)
+            data[self.name] = value
+            if self._is_embedded:
+                cache[self.name] = self.model.from_data(value)
+            elif self._is_array:
+                cache[self.name] = self._convert_data_in_list_to_model(value)
         else:
             if type(instance).retain_none:
-                dk['_data'][self.name] = None
+                data[self.name] = None
             else:
-                dk['_data'].pop(self.name, None)
-            dk.pop(self.name, None)
+                data.pop(self.name, None)
+            cache.pop(self.name, None)
+
+        instance._mark_field(self.name, deleted)
 
     def __delete__(self, instance):
-        dk = instance.__dict__
-        dk['_data'].pop(self.name, None)
-        dk.pop(self.name, None)
+        instance._data.pop(self.name, None)
+        instance._cache.pop(self.name, None)
+        instance._mark_field(self.name, True)
 
-    def __str__(self):
+    @cachedproperty
+    def _repr_prefix(self) -> str:
         string = []
         if self.name:
             string.append('name={!r}'.format(self.name))
-        if True:
-            string.append('required={!r}'.format(self.required))
-        if self.default:
-            string.append('default={!r}'.format(self.default))
-        return '<{} {}>'.format(self.__class__.__name__, ' '.join(string))
+        string.append('required={!r}'.format(self.required))
+        return '<{} {}'.format(self.__class__.__name__, ' '.join(string))
+
+    def __str__(self):
+        if self.default is not None:
+            return '{} default={!r}>'.format(self._repr_prefix, self.default)
+        return self._repr_prefix + '>'
 
     __repr__ = __str__
 
@@ -173,13 +292,11 @@ class StringField(Field):
         self.max_length = max_length
         self.min_length = min_length
 
-    def validate(self, value: Any) -> None:
-        super().validate(value)
-        if value is not None:
-            if self.max_length is not None:
-                validate_max_length(value, self.max_length)
-            if self.min_length is not None:
-                validate_min_length(value, self.min_length)
+    def _value_validation_source(self, ref: str, namespace: Dict[str, Any]) -> List[str]:
+        lines = super()._value_validation_source(ref, namespace)
+        lines.extend(self._limit_source(ref, namespace, 'max_length', self.max_length, 'len(v) > {}'))
+        lines.extend(self._limit_source(ref, namespace, 'min_length', self.min_length, 'len(v) < {}'))
+        return lines
 
 
 class NumberField(Field):
@@ -190,13 +307,11 @@ class NumberField(Field):
         self.max_value = max_value
         self.min_value = min_value
 
-    def validate(self, value: Any) -> None:
-        super().validate(value)
-        if value is not None:
-            if self.max_value is not None:
-                validate_max_value(value, self.max_value)
-            if self.min_value is not None:
-                validate_min_value(value, self.min_value)
+    def _value_validation_source(self, ref: str, namespace: Dict[str, Any]) -> List[str]:
+        lines = super()._value_validation_source(ref, namespace)
+        lines.extend(self._limit_source(ref, namespace, 'max_value', self.max_value, 'v > {}'))
+        lines.extend(self._limit_source(ref, namespace, 'min_value', self.min_value, 'v < {}'))
+        return lines
 
 
 class IntField(NumberField):
@@ -228,6 +343,8 @@ class ListField(Field):
 
 
 class ArrayField(ListField):
+    _is_array = True
+
     def __init__(self, field, **kw):
         from .model import EmbeddedModel
         super().__init__(**kw)
@@ -249,7 +366,10 @@ class ArrayField(ListField):
         if not isinstance(values, (abc.MutableSequence, tuple)):
             raise ValueError('{!r} must be a list-like object, not a {!r}.'.format(values, type(values)))
 
-        return [self.field.convert(value) for value in values]
+        field = self.field
+        if field._is_trivial:
+            return list(values)
+        return [field.convert(value) for value in values]
 
     def validate(self, values: Optional[MutableSequence]) -> None:
         super().validate(values)
@@ -259,33 +379,34 @@ class ArrayField(ListField):
         for value in values:
             self.field.validate(value)
 
+    @cachedproperty
     def innermost(self) -> Field:
-        def inner(array_field: ArrayField):
-            field = array_field.field
-            if not isinstance(field, ArrayField):
-                return field
-            else:
-                return inner(field)
-        return inner(self)
+        field = self.field
+        while field._is_array:
+            field = field.field
+        return field
 
-    def _convert_data_in_list_to_model(self, values: MutableSequence) -> MutableSequence:
-        def walk(array_field: ArrayField, vals: MutableSequence):
-            if not isinstance(vals, abc.MutableSequence):
-                raise ValueError('{!r} must be a list-like object, not a {!r}.'.format(vals, type(vals)))
-
-            if not isinstance(self.innermost(), EmbeddedField):
-                return vals
+    @cachedproperty
+    def _leaf_is_embedded(self) -> bool:
+        return self.innermost._is_embedded
 
-            field = array_field.field
+    @cachedproperty
+    def _list_to_models(self) -> Callable[[MutableSequence], MutableSequence]:
+        # resolve the nested field chain once per field rather than once per element
+        field = self.field
+        if field._is_embedded:
+            return field.model.from_data_many
+        walk = field._convert_data_in_list_to_model
+        return lambda vals: [walk(value) for value in vals]
 
-            if isinstance(field, EmbeddedField):
-                cls = field.model
-                return [cls.from_data(value) for value in vals]
+    def _convert_data_in_list_to_model(self, values: MutableSequence) -> MutableSequence:
+        if not isinstance(values, abc.MutableSequence):
+            raise ValueError('{!r} must be a list-like object, not a {!r}.'.format(values, type(values)))
 
-            if isinstance(field, ArrayField):
-                return [walk(field, value) for value in vals]
+        if not self._leaf_is_embedded:
+            return values
 
-        return walk(self, values)
+        return self._list_to_models(values)
 
     def __str__(self):
         return '<{} item={!r}>'.format(self.__class__.__name__, str(self.field))
@@ -298,6 +419,8 @@ class DictField(Field):
 
 
 class EmbeddedField(DictField):
+    _is_embedded = True
+
     def __init__(self, embedded_model=None, **kw):
         from .model import EmbeddedModel
         super().__init__(**kw)
@@ -317,15 +440,75 @@ class EmbeddedField(DictField):
     def fields(self) -> Dict[str, Field]:
         # dict preserves insertion order from Python 3.6
         # https://mail.python.org/pipermail/python-dev/2017-December/151283.html
-        field_names = self.model.__dict__['_field_order']
-        return {name: getattr(self.model, name) for name in field_names}
+        return self.model.__dict__['_field_dict']
+
+    @property
+    def _fields_list(self) -> Tuple[Tuple[str, Field, str], ...]:
+        # (attribute name, field, stored name) of each declared field
+        return tuple((key, field, field.name) for key, field in self.fields.items())
+
+    @property
+    def _fastpath(self) -> Tuple[Callable, Callable, FrozenSet[str]]:
+        # generated once per model class and shared by every `EmbeddedField` of that model;
+        # dropped by `Field.__setattr__` when an option of one of its fields changes
+        model = self.model
+        rv = model.__dict__.get('_fastpath')
+        if rv is None:
+            rv = model._fastpath = self._build_fastpath()
+        return rv
+
+    def _build_fastpath(self) -> Tuple[Callable, Callable, FrozenSet[str]]:
+        """Generate flat functions which convert and validate all declared fields of the model.
+
+        Fields without a default or converter are converted inline, and fields relying on
+        the compiled `Field.validate` are validated inline;
+        anything else falls back to the field's own `convert` or `validate`.
+        """
+        namespace = {}
+        convert_src = ['def convert_fields(obj, rv, retain_none):']
+        validate_src = ['def validate_fields(obj):']
+        fields_list = self._fields_list
+
+        for i, (key, field, name) in enumerate(fields_list):
+            f = '_f{}'.format(i)
+            namespace[f] = field
+
+            if field._is_trivial:
+                convert_src.append('    v = obj.get({!r})'.format(key))
+            else:
+                convert_src.append('    v = {}.convert(obj.get({!r}))'.format(f, key))
+            convert_src.extend([
+                '    if v is not None:',
+                '        rv[{!r}] = v'.format(name),
+                '    elif retain_none:',
+                '        rv[{!r}] = None'.format(name),
+            ])
+
+            if type(field).validate is Field.validate:
+                validate_src.append('    v = obj.get({!r})'.format(key))
+                validate_src.extend('    ' + line for line in field._validation_source(f, namespace))
+            else:
+                validate_src.append('    {}.validate(obj.get({!r}))'.format(f, key))
+
+        convert_src.append('    return rv')
+        validate_src.append('    return None')
+
+        namespace = _compile_functions(convert_src + validate_src,
+                                       '<monorm fastpath {}>'.format(self.model.__qualname__), namespace)
+        names = frozenset(name for _, _, name in fields_list)
+        return namespace['convert_fields'], namespace['validate_fields'], names
 
     def convert(self, obj: Any) -> Optional[MutableMapping]:
-        if isinstance(obj, self.model):
+        model = self.model
+        t = type(obj)
+        if t is model or issubclass(t, model):
             # we can safely skip `convert` and 'validate` because it should has been done before.
-            # `dict` cannot be used because setting a new attr on it is valid.
+            # a plain `dict` cannot carry the mark, in which case the data will be validated again.
             dk = obj.to_dict()
-            dk._skip_validate = True
+            try:
+                dk._skip_validate = True
+            except AttributeError:
+                pass
             return dk
 
         obj = super().convert(obj)
@@ -335,20 +518,15 @@ class EmbeddedField(DictField):
         if not isinstance(obj, MutableMapping):
             raise ValueError('{!r} must be a dict-like object, not a {!r}.'.format(obj, type(obj)))
 
-        fields = self.fields
-        rv = self.model.dict_class()
-
-        for name, field in fields.items():
-            value = field.convert(obj.get(name))
-            if value is not None:
-                rv[field.name] = value
-            else:
-                if self.model.retain_none:
-                    rv[field.name] = None
+        convert_fields, _, _ = self._fastpath
+        rv = convert_fields(obj, model.dict_class(), model.retain_none)
 
-        for name, value in obj.items():
-            if name not in fields:
-                rv[name] = value
+        # undeclared keys are kept as they are, in their original order
+        field_set = model.__dict__['_field_set']
+        if not field_set.issuperset(obj):
+            for name, value in obj.items():
+                if name not in field_set:
+                    rv[name] = value
 
         return rv
 
@@ -360,13 +538,11 @@ class EmbeddedField(DictField):
         if obj is None:
             return
 
-        fields = self.fields
-        for name, field in fields.items():
-            field.validate(obj.get(name))
+        _, validate_fields, names = self._fastpath
+        validate_fields(obj)
 
         if self.model.warn_extra_data:
-            names = [field.name for field in fields.values()]
-            for key, value in obj.items():
+            for key in obj.keys():
                 if key not in names:
                     warn('{!r} not defined in model {!r}. Did you misspell it?'.format(key, self.model))
 
@@ -1,11 +1,11 @@
-from collections import OrderedDict
 from datetime import datetime
-from typing import get_type_hints, Any, MutableMapping, Type, Union, Callable, List, Iterable, Optional, Set
+from typing import get_type_hints, Any, MutableMapping, Type, Union, Callable, List, Iterable, Tuple
 
 from bson.json_util import dumps
 from bson.objectid import ObjectId
 
 from .fields import *
+from .fields import DataDict
 from .utils import *
 
 __all__ = [
@@ -26,25 +26,31 @@ hint_field_map = {
     Any: AnyField,
 }
 
+# In Python 3.6 the origin of `List[int]` is `typing.List` while it's `list` from 3.7
+_list_origins = frozenset([list, List])
+
 
 def _hint_to_field(hint_type: Union[Type, Any]) -> Field:
     if hint_type in hint_field_map:
         return hint_field_map[hint_type]()
     if isclass(hint_type) and issubclass(hint_type, EmbeddedModel):
         return EmbeddedField(hint_type)
-    # In Python 3.6 it's `typing.List` while 'list' in 3.7
-    if hint_type.__dict__.get('__origin__') in (list, List):
-        # noinspection PyUnresolvedReferences
-        arg = hint_type.__args__[0]
-        if str(arg) == '~T':
+    if getattr(hint_type, '__origin__', None) in _list_origins:
+        # a bare `List` has no arguments, or only the type variable `~T` before Python 3.9
+        args = getattr(hint_type, '__args__', None)
+        if not args or str(args[0]) == '~T':
             return ListField()
-        else:
-            return ArrayField(_hint_to_field(arg))
+        return ArrayField(_hint_to_field(args[0]))
     raise TypeError('cannot convert {!r} to a field'.format(hint_type))
 
 
+_NO_FIELDS = frozenset()
+
+
 class ModelType(type):
     def __new__(mcs, name, bases, attrs):
+        attrs.setdefault('__slots__', ())
+
         if '_no_parse_hints' in attrs:
             return super().__new__(mcs, name, bases, attrs)
 
@@ -52,7 +58,7 @@ class ModelType(type):
         field_order = []
 
         for key, value in attrs.items():
-            if isinstance(value, Field):
+            if getattr(type(value), '_is_field', False):
                 if value.name is None:
                     value.name = key
                 field_order.append(key)
@@ -87,8 +93,18 @@ class ModelType(type):
 
             setattr(cls, name, field)
 
+    def _index_fields(cls) -> None:
+        field_order = cls.__dict__['_field_order']
+        cls._field_order = tuple(field_order)
+        cls._field_set = frozenset(field_order)
+        cls._field_dict = {name: cls.__dict__[name] for name in field_order}
+        for field in cls._field_dict.values():
+            field._owners += (cls,)
+        cls._has_embedded_fields = any(field._is_embedded for field in cls._field_dict.values()) or \
+            any(getattr(base, '_has_embedded_fields', False) for base in cls.__bases__)
+
     def _process_meta(cls) -> None:
-        fields = {key: value for key, value in cls.__dict__.items() if isinstance(value, Field)}
+        fields = cls.__dict__['_field_dict']
         meta = cls.__dict__.get('Meta')
         aliases = getattr(meta, 'aliases', [])
         required = getattr(meta, 'required', [])
@@ -121,25 +137,29 @@ class ModelType(type):
     def __init__(cls, name, bases, attrs):
         if '_no_parse_hints' not in cls.__dict__:
             cls._parse_type_hints()
+            cls._index_fields()
             cls._process_meta()
+            # the root field wraps the whole model; built once since its `fields` are cached
+            cls._root_field = EmbeddedField().init_root(cls)
 
         super().__init__(name, bases, attrs)
 
     @classmethod
     def __prepare__(mcs, name, bases) -> MutableMapping:
-        # class attribute definition order is preserved from python 3.6,
-        # but cls.__dict__ will be updated by `setattr` in :meth:`~ModelType._parse_type_hints`;
-        # to avoid bugs or dependencies on implementation details, here we return an `OrderedDict`.
+        # class attribute definition order is preserved from python 3.6 and
+        # a plain dict keeps insertion order, so no `OrderedDict` is needed here;
+        # the field order itself is tracked in `_field_order`, since cls.__dict__
+        # will be updated by `setattr` in :meth:`~ModelType._parse_type_hints`.
         # https://www.python.org/dev/peps/pep-0520/
-        return OrderedDict()
+        return {}
 
 
 class BaseModel(metaclass=ModelType):
     """Base class of all model classes"""
 
-    # The underlying data of models are saved in a ordered dict-like object.
+    # The underlying data of models are saved in an ordered dict-like object.
     # You can change it to `collections.OrderedDict`, `bson.son.SON` or other compatible types.
-    dict_class: Type[MutableMapping] = OrderedDict
+    dict_class: Type[MutableMapping] = DataDict
 
     retain_none: bool = True
 
@@ -153,13 +173,23 @@ class BaseModel(metaclass=ModelType):
     _no_parse_hints: bool = True
     __no_type_check__: bool = False
 
+    # Instance state is kept in slots instead of a `__dict__`: the underlying data, the embedded
+    # model objects materialized from it, and the names of fields changed since the last save.
+    # Model classes get an empty `__slots__` from `ModelType` unless they declare one themselves,
+    # so only declared fields can be set on instances; add '__dict__' to `__slots__` to opt out.
+    __slots__ = ('_data', '_cache', '_modified_fields', '_deleted_fields', '__weakref__')
+
+    # Whether instances may hold embedded model objects whose changes need to be collected.
+    _has_embedded_fields: bool = False
+
     def __init__(self,
                  bypass_conversion: bool = False,
                  bypass_validation: bool = False,
                  **kw):
         self._data = self._clean(kw, bypass_conversion, bypass_validation)
-        self._modified_fields: Optional[Set[str]] = None
-        self._deleted_fields: Optional[Set[str]] = None
+        self._cache = {}
+        self._modified_fields = _NO_FIELDS
+        self._deleted_fields = _NO_FIELDS
 
     # noinspection PyCallByClass
     def to_json(self, *arg, **kw) -> str:
@@ -173,7 +203,7 @@ class BaseModel(metaclass=ModelType):
                data: MutableMapping,
                bypass_conversion: bool = False,
                bypass_validation: bool = False) -> MutableMapping:
-        root = EmbeddedField().init_root(cls)
+        root = cls.__dict__['_root_field']
         if not bypass_conversion:
             data = root.convert(data)
         if not bypass_validation:
@@ -183,68 +213,72 @@ class BaseModel(metaclass=ModelType):
     @classmethod
     def from_data(cls, data: MutableMapping):
         """Construct an instance of this class from the given data; bypass conversion and validation"""
-        obj = cls(bypass_conversion=True, bypass_validation=True)
+        # `__init__` is skipped entirely since there is nothing to clean
+        obj = cls.__new__(cls)
         obj._data = data
+        obj._cache = {}
+        obj._modified_fields = _NO_FIELDS
+        obj._deleted_fields = _NO_FIELDS
         return obj
 
-    def _init_marked_fields(self) -> None:
-        dk = self.__dict__
-        if self._modified_fields is None:
-            dk['_modified_fields'] = set()
-        if self._deleted_fields is None:
-            dk['_deleted_fields'] = set()
+    @classmethod
+    def from_data_many(cls, data_list: Iterable[MutableMapping]) -> List['BaseModel']:
+        """Construct instances of this class from each of the given data; bypass conversion and validation"""
+        from_data = cls.from_data
+        return [from_data(data) for data in data_list]
+
+    def _mark_field(self, name: str, deleted: bool = False) -> None:
+        # copy on write: the shared empty frozenset is only replaced once a field is marked;
+        # check the type since pickling or copying an instance creates a new empty frozenset
+        if type(self._modified_fields) is not set:
+            self._modified_fields = set()
+            self._deleted_fields = set()
+
+        if deleted:
+            self._deleted_fields.add(name)
+            self._modified_fields.discard(name)
+        else:
+            self._modified_fields.add(name)
+            self._deleted_fields.discard(name)
 
     def _clear_marked_fields(self) -> None:
         if self._modified_fields:
             self._modified_fields.clear()
-        if self._modified_fields:
+        if self._deleted_fields:
             self._deleted_fields.clear()
 
-        for value in self.__dict__.values():
+        if not type(self)._has_embedded_fields:
+            return
+
+        for value in self._cache.values():
             if isinstance(value, EmbeddedModel):
                 value._clear_marked_fields()
 
-    def _combine_marked_fields(self):
+    def _combine_marked_fields(self) -> Tuple[List[str], List[str]]:
         modified = []
         deleted = []
 
-        def combine(instance, prev, attr_name, result):
-            fields = getattr(instance, attr_name)
-            if fields is None:
-                fields = set()
-
-            for name in fields:
-                result.append(prev + name)
+        def combine(instance, prev, with_modified, with_deleted):
+            modified_fields = instance._modified_fields
+            deleted_fields = instance._deleted_fields
 
-            for key, value in instance.__dict__.items():
-                if isinstance(value, EmbeddedModel) and key not in fields:
-                    combine(value, prev + key + '.', attr_name, result)
+            if with_modified:
+                modified.extend(prev + name for name in modified_fields)
+            if with_deleted:
+                deleted.extend(prev + name for name in deleted_fields)
 
-        combine(self, '', '_modified_fields', modified)
-        combine(self, '', '_deleted_fields', deleted)
-        return modified, deleted
+            if not type(instance)._has_embedded_fields:
+                return
 
-    def __setattr__(self, name, value):
-        fields = type(self).__dict__['_field_order']
+            for key, value in instance._cache.items():
+                if isinstance(value, EmbeddedModel):
+                    sub_modified = with_modified and key not in modified_fields
+                    sub_deleted = with_deleted and key not in deleted_fields
+                    if sub_modified or sub_deleted:
+                        combine(value, prev + key + '.', sub_modified, sub_deleted)
 
-        if name in fields:
-            self._init_marked_fields()
-            if not self.retain_none and value is None:
-                self._deleted_fields.add(name)
-                self._modified_fields.discard(name)
-            else:
-                self._modified_fields.add(name)
-                self._deleted_fields.discard(name)
-        return super().__setattr__(name, value)
-
-    def __delattr__(self, name):
-        fields = type(self).__dict__['_field_order']
-
-        if name in fields:
-            self._init_marked_fields()
-            self._deleted_fields.add(name)
-            self._modified_fields.discard(name)
-        return super().__delattr__(name)
+        combine(self, '', True, True)
+        return modified, deleted
 
     def __iter__(self) -> Iterable[str]:
         return iter(self._data)
@@ -252,4 +286,5 @@ class BaseModel(metaclass=ModelType):
 
 class EmbeddedModel(BaseModel):
     """Base class of user-defined embedded model"""
+    __slots__ = ()
     _no_parse_hints: bool = True
@@ -208,6 +208,8 @@ class MongoModel(BaseModel, metaclass=MongoModelType):
 
     _no_parse_hints: bool = True
 
+    __slots__ = ('_state',)
+
     def __init__(self, **kw):
         super().__init__(**kw)
         self._state = 'before_save'
@@ -270,6 +272,13 @@ class MongoModel(BaseModel, metaclass=MongoModelType):
         self._state = 'deleted'
         self._clear_marked_fields()
 
+    @classmethod
+    def from_data(cls, data: MutableMapping):
+        """Construct an instance of this class from the given data; bypass conversion and validation"""
+        obj = super().from_data(data)
+        obj._state = 'before_save'
+        return obj
+
     @classmethod
     def from_document(cls, doc: MutableMapping):
         """Construct an instance of this class from the given document."""
@@ -373,7 +382,7 @@ class MongoModel(BaseModel, metaclass=MongoModelType):
         def raise_parse_error(k: str, fld: Field):
             raise ValueError('cannot parse {!r}; not expect {!r} after {!r}'.format(name, k, fld))
 
-        field = EmbeddedField().init_root(cls)
+        field = cls.__dict__['_root_field']
         for key in name.split('.'):
             if isinstance(field, AnyField):
                 return AnyField()
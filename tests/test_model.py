@@ -1,5 +1,8 @@
-from collections import abc
-from collections import OrderedDict
+import copy
+import gc
+import pickle
+import weakref
+from collections import abc, UserDict, UserList
 from datetime import datetime
 from typing import List, Any
 
@@ -8,7 +11,9 @@ from bson.objectid import ObjectId
 from bson.son import SON
 
 from monorm import BaseModel, EmbeddedModel
+from monorm.model import DataDict
 from monorm.fields import *
+from monorm.fields import validate_type
 
 
 class TestBaseField:
@@ -163,6 +168,134 @@ class TestBaseField:
             MM(f='abc')
 
 
+def test_field_validate_after_option_change():
+    field = StringField(name='f')
+    field.validate(None)
+    field.validate('abcd')
+
+    field.required = True
+    field.max_length = 3
+    with pytest.raises(ValidationError) as err:
+        field.validate(None)
+    assert 'missing' in err.value.msg
+    with pytest.raises(ValidationError) as err:
+        field.validate('abcd')
+    assert 'greater than' in err.value.msg
+
+
+def test_field_str():
+    field = IntField(default=0)
+    assert str(field) == '<IntField required=False default=0>'
+
+    field.name = 'f'
+    field.required = True
+    assert str(field) == "<IntField name='f' required=True default=0>"
+
+
+def test_model_validate_after_field_option_change(caplog):
+    class MainModel(BaseModel):
+        f = StringField()
+
+    MainModel(f='abcd')
+    MainModel()
+
+    MainModel.f.max_length = 3
+    MainModel.f.required = True
+    with pytest.raises(ValidationError) as err:
+        MainModel(f='abcd')
+    assert 'greater than' in err.value.msg
+    with pytest.raises(ValidationError) as err:
+        MainModel()
+    assert 'missing' in err.value.msg
+
+    class AliasModel(BaseModel):
+        f: str
+
+    AliasModel(f='a')
+    AliasModel.f.name = 'ff'
+    obj = AliasModel(f='a')
+    assert obj.to_dict() == {'ff': 'a'}
+    assert len(caplog.records) == 0
+
+
+def test_model_convert_after_field_option_change():
+    class MainModel(BaseModel):
+        f1: str
+        f2: int
+
+    assert MainModel(f1='a').f1 == 'a'
+
+    MainModel.f1.converter = str.upper
+    MainModel.f2.default = 42
+    obj = MainModel(f1='a')
+    assert obj.f1 == 'A'
+    assert obj.f2 == 42
+
+
+class TestFieldTypeCheck:
+    def test_list_subclasses(self):
+        class MyList(list):
+            pass
+
+        field = ListField(name='f')
+        field.validate([1])
+        field.validate(MyList([1]))
+        field.validate(UserList([1]))
+
+    def test_dict_subclasses(self):
+        class MyMapping(abc.MutableMapping):
+            def __init__(self):
+                self.data = {}
+
+            def __getitem__(self, key):
+                return self.data[key]
+
+            def __setitem__(self, key, value):
+                self.data[key] = value
+
+            def __delitem__(self, key):
+                del self.data[key]
+
+            def __iter__(self):
+                return iter(self.data)
+
+            def __len__(self):
+                return len(self.data)
+
+        field = DictField(name='f')
+        field.validate({})
+        field.validate(SON())
+        field.validate(UserDict())
+        field.validate(MyMapping())
+
+    def test_converted_payload(self):
+        class SubModel(EmbeddedModel):
+            f: int
+
+        field = EmbeddedField(SubModel, name='f')
+        data = field.convert({'f': 1})
+        assert type(data) is DataDict
+        field.validate(data)
+
+        # the converted payload passes the exact type check without going through `isinstance`
+        namespace = {}
+        field._value_validation_source('_f', namespace)
+        assert type(data) in namespace['_f_exact']
+
+    def test_wrong_type_message(self):
+        for field, value in [(IntField(), 'a'), (ListField(), (1,)), (DictField(), []), (NumberField(), 'a')]:
+            with pytest.raises(ValidationError) as err:
+                field.validate(value)
+            with pytest.raises(ValidationError) as expected:
+                validate_type(value, field.expected_types)
+            assert err.value.msg == expected.value.msg
+
+    def test_any_field_skips_type_check(self):
+        namespace = {}
+        assert AnyField()._value_validation_source('_f', namespace) == []
+        AnyField(name='f').validate(object())
+
+
 def test_any_field():
     class MainModel(BaseModel):
         f: Any
@@ -172,6 +305,15 @@ def test_any_field():
     MainModel(f=[1, 2, 3])
 
 
+def test_bare_list_hint():
+    class MM(BaseModel):
+        f: List
+
+    assert type(MM.f) is ListField
+    obj = MM(f=[1, 'a'])
+    assert obj.f == [1, 'a']
+
+
 class TestEmbeddedField:
     def test_attr_proxy_with_set_get(self):
         class SubSubModel(EmbeddedModel):
@@ -243,6 +385,35 @@ class TestEmbeddedField:
         obj.f3 = [sub2]
         assert hasattr(sub2.to_dict(), '_skip_validate')
 
+    def test_cached_value(self):
+        class SubModel(EmbeddedModel):
+            f: int
+
+        class MainModel(BaseModel):
+            f1: SubModel
+            f2: List[SubModel]
+
+        obj = MainModel(f1={'f': 1}, f2=[{'f': 2}])
+        assert obj.f1 is obj.f1
+        assert obj.f2 is obj.f2
+        assert obj.f2[0] is obj.f2[0]
+
+        obj.f1 = None
+        obj.f2 = None
+        assert obj.f1 is None
+        assert obj.f2 is None
+
+        obj.f1 = {'f': 3}
+        obj.f2 = [{'f': 4}]
+        assert obj.f1.f == 3 and obj.f2[0].f == 4
+
+        del obj.f1
+        del obj.f2
+        with pytest.raises(AttributeError):
+            _ = obj.f1
+        with pytest.raises(AttributeError):
+            _ = obj.f2
+
     def test_pass_in_wrong_type(self):
         with pytest.raises(TypeError) as err:
             class Foo:
@@ -317,6 +488,28 @@ class TestArrayField:
         assert isinstance(obj.f1[1][0], SubModel)
         assert isinstance(obj.f1[1][0].f2[0], SubSubModel)
 
+    def test_item_converter(self):
+        class MainModel(BaseModel):
+            f1 = ArrayField(StringField(converter=str.upper))
+            f2 = ArrayField(StringField())
+
+        obj = MainModel(f1=['a', 'b'], f2=('a', 'b'))
+        assert obj.f1 == ['A', 'B']
+        assert obj.f2 == ['a', 'b']
+
+    def test_innermost(self):
+        class SubModel(EmbeddedModel):
+            f1: str
+
+        field = ArrayField(ArrayField(SubModel))
+        assert isinstance(field.innermost, EmbeddedField)
+        assert field.innermost.model is SubModel
+        assert field._leaf_is_embedded
+
+        field = ArrayField(ArrayField(IntField()))
+        assert isinstance(field.innermost, IntField)
+        assert not field._leaf_is_embedded
+
     def test_pass_in_wrong_type(self):
         with pytest.raises(TypeError) as err:
             class Foo:
@@ -327,6 +520,37 @@ class TestArrayField:
         assert 'EmbeddedModel' in err.value.args[0]
 
 
+def test_same_hint_builds_distinct_fields():
+    class SubModel(EmbeddedModel):
+        f: int
+
+    class MainModel(BaseModel):
+        f1: List[SubModel]
+        f2: List[SubModel]
+
+        class Meta:
+            required = ['f1']
+
+    assert MainModel.f1 is not MainModel.f2
+    assert MainModel.f1.field is not MainModel.f2.field
+    assert MainModel.f1.required and not MainModel.f2.required
+
+
+def test_hint_resolution_does_not_keep_models_alive():
+    def define():
+        class SubModel(EmbeddedModel):
+            f: int
+
+        class MainModel(BaseModel):
+            f: SubModel
+
+        return weakref.ref(SubModel), weakref.ref(MainModel)
+
+    refs = define()
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+
+
 def test_invalid_field_type():
     class Foo:
         pass
@@ -536,6 +760,18 @@ def test_field_validators():
 
     MainModel(f1='hello')
 
+    calls = []
+
+    def validator(x):
+        calls.append(x)
+        return False
+
+    field = StringField(name='f', validator=validator)
+    with pytest.raises(ValidationError) as err:
+        field.validate('a')
+    assert err.value.msg == "'a' was not accepted by validator {!r}.".format(validator)
+    assert calls == ['a']
+
     with pytest.raises(ValidationError) as err:
         MainModel(f1='a')
     assert 'not accepted' in err.value.msg
@@ -547,6 +783,98 @@ def test_field_validators():
         MainModel(f3=[{'f': 'a'}])
 
 
+def test_model_fastpath():
+    class EvenField(IntField):
+        def validate(self, value):
+            super().validate(value)
+            if value is not None and value % 2:
+                raise ValidationError('{!r} is odd.'.format(value))
+
+    class MainModel(BaseModel):
+        f1 = StringField(max_length=3, default='abc')
+        f2 = IntField(min_value=0, required=True)
+        f3 = EvenField()
+
+    obj = MainModel(f2=1, f3=2)
+    assert obj.to_dict() == {'f1': 'abc', 'f2': 1, 'f3': 2}
+    assert '_fastpath' in MainModel.__dict__
+
+    with pytest.raises(ValidationError) as err:
+        MainModel(f2=-1)
+    assert 'less than' in err.value.msg
+
+    with pytest.raises(ValidationError) as err:
+        MainModel(f2=1, f3=3)
+    assert 'odd' in err.value.msg
+
+
+def test_model_marked_fields():
+    class SubModel(EmbeddedModel):
+        f: int
+        g: int
+
+    class MainModel(BaseModel):
+        f1: int
+        f2: SubModel
+
+    obj = MainModel(f1=1, f2={'f': 2, 'g': 3})
+    assert obj._combine_marked_fields() == ([], [])
+
+    obj.f1 = 3
+    obj.f2.f = 4
+    del obj.f2.g
+    assert obj._combine_marked_fields() == (['f1', 'f2.f'], ['f2.g'])
+
+    obj._clear_marked_fields()
+    assert obj._combine_marked_fields() == ([], [])
+
+
+def test_model_slots():
+    class SubModel(EmbeddedModel):
+        f: int
+
+    class MainModel(BaseModel):
+        f1: int
+        f2: SubModel
+
+    obj = MainModel(f1=1, f2={'f': 2})
+    assert not hasattr(obj, '__dict__')
+    assert not hasattr(obj.f2, '__dict__')
+    with pytest.raises(AttributeError):
+        obj.foo = 'bar'
+
+    class DictModel(BaseModel):
+        __slots__ = ('__dict__',)
+        f: int
+
+    obj = DictModel(f=1)
+    obj.foo = 'bar'
+    assert obj.foo == 'bar'
+
+
+class PickleSubModel(EmbeddedModel):
+    f: int
+
+
+class PickleModel(BaseModel):
+    f1: int
+    f2: PickleSubModel
+
+
+@pytest.mark.parametrize('clone', [copy.copy, copy.deepcopy, lambda o: pickle.loads(pickle.dumps(o))])
+def test_model_marked_fields_after_clone(clone):
+    obj = clone(PickleModel(f1=1, f2={'f': 2}))
+    assert obj._combine_marked_fields() == ([], [])
+
+    obj.f1 = 3
+    obj.f2.f = 4
+    assert obj.f1 == 3
+    assert obj._combine_marked_fields() == (['f1', 'f2.f'], [])
+
+    del obj.f1
+    assert obj._combine_marked_fields() == (['f2.f'], ['f1'])
+
+
 def test_model_iter():
     class SubModel(EmbeddedModel):
         f: int
@@ -656,6 +984,19 @@ def test_model_from_data_directly():
         _ = obj.f2
 
 
+def test_model_from_data_many():
+    class MainModel(BaseModel):
+        f: int
+
+    objs = MainModel.from_data_many([{'f': 1}, {'f': 2}])
+    assert [type(obj) for obj in objs] == [MainModel, MainModel]
+    assert [obj.f for obj in objs] == [1, 2]
+
+    objs[0].f = 3
+    assert objs[0]._combine_marked_fields() == (['f'], [])
+    assert objs[1]._combine_marked_fields() == ([], [])
+
+
 class TestModelDictClass:
     def test_dict_type(self):
         class SubModel(EmbeddedModel):
@@ -675,9 +1016,22 @@ class TestModelDictClass:
         assert list(obj.d.to_dict().keys()) == ['b', 'c', 'a']
         assert list(obj.e[0].to_dict().keys()) == ['b', 'c', 'a']
 
-        assert type(obj.to_dict()) == OrderedDict
-        assert type(obj.d.to_dict()) == OrderedDict
-        assert type(obj.e[0].to_dict()) == OrderedDict
+        assert type(obj.to_dict()) == DataDict
+        assert type(obj.d.to_dict()) == DataDict
+        assert type(obj.e[0].to_dict()) == DataDict
+
+    def test_dict_type_with_plain_dict(self):
+        class SubModel(EmbeddedModel):
+            f: int
+
+        class MainModel(BaseModel):
+            f: SubModel
+
+        MainModel.dict_class = dict
+        SubModel.dict_class = dict
+        obj = MainModel(f=SubModel(f=1))
+        assert type(obj.to_dict()) == dict
+        assert obj.f.f == 1
 
     def test_dict_type_with_son(self):
         class SubModel(EmbeddedModel):
@@ -744,6 +1098,23 @@ def test_model_extra_data_warning(caplog):
         assert 'not defined' in record.message
 
 
+def test_model_keep_extra_data():
+    class MainModel(BaseModel):
+        f: int
+
+    MainModel.warn_extra_data = False
+    obj = MainModel(z=1, f=2, a=3, m=4)
+    assert list(obj.to_dict().items()) == [('f', 2), ('z', 1), ('a', 3), ('m', 4)]
+
+    class ListKeysSON(SON):
+        # `SON.keys()` returns a list in pymongo 3
+        def keys(self):
+            return list(super().keys())
+
+    data = MainModel._clean(ListKeysSON([('z', 1), ('f', 2)]))
+    assert list(data.items()) == [('f', 2), ('z', 1)]
+
+
 def test_model_disable_extra_data_warning(caplog):
     class MainModel(BaseModel):
         f: int